@@ -0,0 +1,167 @@
+import logging
+from collections import deque
+from functools import partial
+from typing import Any, Hashable, Union
+
+from PySide6 import QtCore as qtc
+from PySide6 import QtNetwork as qtn
+
+from library_of_h.downloader.base_classes.metadata import GalleryMetadataBase
+from library_of_h.downloader.base_classes.network_access_manager import \
+    NetworkAccessManagerBase
+
+
+class ExtractorBase(qtc.QObject):
+    """
+    Fetches the metadata of the next galleries of the current item ahead of
+    time, while the files of the current gallery are being downloaded, so that
+    the download does not stall at gallery boundaries.
+    """
+
+    _logger: logging.Logger
+    _network_access_manager: NetworkAccessManagerBase
+
+    metadata_ready_signal: qtc.Signal
+
+    _PREFETCH_GALLERIES = 2  # Number of galleries prefetched ahead of time.
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._reset_prefetch()
+
+    def _reset_prefetch(self) -> None:
+        # Galleries taken out of the current item ahead of time, in order.
+        self._prefetch_queue = deque()
+        # Gallery -> its metadata; `None` while the metadata is being fetched,
+        # an error code if it could not be fetched.
+        self._prefetched_metadata: dict[
+            Hashable, Union[GalleryMetadataBase, int, None]
+        ] = {}
+        # Gallery whose metadata is to be emitted as soon as it is ready.
+        self._wanted_gallery = None
+
+    def _next_gallery_ahead(self) -> Hashable:
+        """
+        Takes the next gallery out of the current item, without affecting the
+        progress of the item.
+
+        Raises
+        -------
+            StopIteration:
+                No more galleries are known ahead of time.
+        """
+        raise NotImplementedError
+
+    def _gallery_metadata_url(self, gallery: Hashable) -> str:
+        """
+        URL to get the metadata of `gallery` from.
+        """
+        raise NotImplementedError
+
+    def _extract_gallery_metadata(
+        self, gallery: Hashable, reply_text: str
+    ) -> Union[GalleryMetadataBase, None]:
+        """
+        Extracts the metadata of `gallery` from `reply_text`.
+
+        Returns
+        --------
+            Union[
+                GalleryMetadataBase:
+                    The gallery's metadata.
+                None:
+                    Extraction failed, the error has already been logged.
+            ]
+        """
+        raise NotImplementedError
+
+    def _gallery_metadata_not_found(self, gallery: Hashable) -> None:
+        """
+        Called when the metadata of the wanted `gallery` does not exist.
+        """
+        raise NotImplementedError
+
+    def _take_prefetched_gallery(self) -> Union[Hashable, None]:
+        """
+        Returns the next gallery that was taken out of the current item ahead of
+        time, `None` if there is none.
+        """
+        if self._prefetch_queue:
+            return self._prefetch_queue.popleft()
+        return None
+
+    def get_gallery_metadata(self, gallery: Hashable) -> None:
+        """
+        Gets the metadata of `gallery`, emitted with `metadata_ready_signal`,
+        and prefetches the metadata of the galleries after it.
+        """
+        self._wanted_gallery = gallery
+        if gallery not in self._prefetched_metadata:
+            self._fetch_gallery_metadata(gallery)
+        elif self._prefetched_metadata[gallery] is not None:
+            self._deliver_gallery_metadata(gallery)
+
+        self._prefetch_gallery_metadata()
+
+    def _prefetch_gallery_metadata(self) -> None:
+        while len(self._prefetch_queue) < self._PREFETCH_GALLERIES:
+            try:
+                gallery = self._next_gallery_ahead()
+            except StopIteration:
+                return
+
+            self._prefetch_queue.append(gallery)
+            if gallery not in self._prefetched_metadata:
+                self._fetch_gallery_metadata(gallery)
+
+    def _fetch_gallery_metadata(self, gallery: Hashable) -> None:
+        self._prefetched_metadata[gallery] = None
+        self._network_access_manager.queue_request(
+            "get",
+            self._network_access_manager.create_request(
+                self._gallery_metadata_url(gallery)
+            ),
+            partial(self._get_gallery_metadata_reply_slot, gallery),
+        )
+
+    def _get_gallery_metadata_reply_slot(
+        self, gallery: Hashable, reply: qtn.QNetworkReply
+    ) -> None:
+        reply.finished.connect(
+            partial(self._get_gallery_metadata_finished_slot, gallery, reply)
+        )
+
+    def _get_gallery_metadata_finished_slot(
+        self, gallery: Hashable, reply: qtn.QNetworkReply
+    ) -> None:
+        reply.deleteLater()
+        if gallery not in self._prefetched_metadata:
+            # Prefetched for an item that is not being downloaded anymore.
+            return
+
+        handled = self._network_access_manager.handle_error(
+            reply.error(), partial(self._fetch_gallery_metadata, gallery)
+        )
+        if handled == 203:
+            self._prefetched_metadata[gallery] = handled
+        elif handled != 0:
+            return
+        else:
+            gallery_metadata = self._extract_gallery_metadata(
+                gallery, reply.readAll().data().decode("utf-8")
+            )
+            if gallery_metadata is None:
+                return
+            self._prefetched_metadata[gallery] = gallery_metadata
+
+        if gallery == self._wanted_gallery:
+            self._deliver_gallery_metadata(gallery)
+
+    def _deliver_gallery_metadata(self, gallery: Hashable) -> None:
+        self._wanted_gallery = None
+        gallery_metadata: Any = self._prefetched_metadata.pop(gallery)
+        if isinstance(gallery_metadata, int):
+            self._gallery_metadata_not_found(gallery)
+        else:
+            self.metadata_ready_signal.emit(gallery_metadata)
@@ -1,8 +1,14 @@
 import logging
+from collections import deque
+from functools import partial
+from typing import Callable
 
 from PySide6 import QtCore as qtc
 from PySide6 import QtNetwork as qtn
 
+from library_of_h.miscellaneous.classes.token_bucket import TokenBucket
+from library_of_h.preferences import Preferences
+
 
 class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
 
@@ -10,7 +16,9 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
 
     _RETRY_COOLDOWN = 3000  # Microseconds or 3 Seconds
     _REPLY_TIMEOUT = 10_000  # Microseconds or 10 Seconds
-    _REQUEST_COOLDOWN = 2000  # Microseconds or 2 Seconds
+    # Hosts serving webpages/metadata, every other host of the service is
+    # considered an image CDN. Both have their own rate limits.
+    _API_HOSTS: tuple[str, ...] = ()
 
     disconnected = qtc.Signal()
     reconnected = qtc.Signal()
@@ -19,6 +27,10 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         super().__init__(*args, **kwargs)
 
         self._reconnect_callback = None
+        # Reconnect callbacks of the requests that failed with a temporary
+        # error, called once the connection is back.
+        self._reconnect_callbacks = []
+        self._pending_reconnect_callback = None
         self._retry_url = "https://github.com/london-69/library-of-h"
 
         # For when `abort()` is called on `reply` due to timeout.
@@ -30,19 +42,18 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         self._retry_timer.setInterval(self._RETRY_COOLDOWN)
         self._retry_timer.timeout.connect(self._retry)
 
-        self._cooldown_timer_get = qtc.QElapsedTimer()
-        self._cooldown_timer_get.start()
-
-        self._cooldown_timer_head = qtc.QElapsedTimer()
-        self._cooldown_timer_head.start()
-
-        self._cooldown_wait_timer_get = qtc.QTimer()
-        self._cooldown_wait_timer_get.setSingleShot(True)
-        self._cooldown_wait_timer_get.timeout.connect(self.get)
+        # "Hitomi" for `HitomiNetworkAccessManager` and so on.
+        service = type(self).__name__.removesuffix("NetworkAccessManager")
+        self._rate_limits = Preferences.get_instance()[
+            "download_preferences", "rate_limits", service
+        ]
 
-        self._cooldown_wait_timer_head = qtc.QTimer()
-        self._cooldown_wait_timer_head.setSingleShot(True)
-        self._cooldown_wait_timer_head.timeout.connect(self.head)
+        # Host -> requests waiting for a token of the host's token bucket.
+        # Hosts are rate limited independently, so requests to one host never
+        # wait behind requests to another.
+        self._request_queues: dict[str, deque] = {}
+        self._token_buckets: dict[str, TokenBucket] = {}
+        self._request_queue_timers: dict[str, qtc.QTimer] = {}
 
         self._request = qtn.QNetworkRequest()
         self._request.setTransferTimeout(self._REPLY_TIMEOUT)
@@ -71,25 +82,49 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         url = qtc.QUrl(url)
         self._request.setUrl(url)
 
+    def create_request(self, url: str) -> qtn.QNetworkRequest:
+        """
+        Creates a copy of the shared request, with all its headers, for `url`.
+        """
+        request = qtn.QNetworkRequest(self._request)
+        request.setUrl(qtc.QUrl(url))
+        return request
+
     def abort(self):
         self._timeout = False
         self.reply.abort()
 
     def _retry_finished_slot(self) -> None:
-        handled = self.handle_error(self.reply.error())
-        if handled != 0:
-            return
-        else:
-            self.reconnected.emit()
-            self._logger.info("Reconnected.")
-            if self._reconnect_callback:
-                self._reconnect_callback()
+        error = self._retry_reply.error()
+        self._retry_reply.deleteLater()
+        if error != qtn.QNetworkReply.NetworkError.NoError:
+            self._logger.warning(
+                f"[{int(error)} {error.name}] Failed to reconnect: retrying."
+            )
+            self._retry_timer.start()
             return
 
+        self.reconnected.emit()
+        self._logger.info("Reconnected.")
+        reconnect_callbacks, self._reconnect_callbacks = self._reconnect_callbacks, []
+        for reconnect_callback in reconnect_callbacks:
+            reconnect_callback()
+
     def _retry(self) -> None:
-        self.set_request_url(self._retry_url)
-        self.reply = super().head(self._request)
-        self.reply.finished.connect(self._retry_finished_slot)
+        self._retry_reply = super().head(self.create_request(self._retry_url))
+        self._retry_reply.finished.connect(self._retry_finished_slot)
+
+    def _retry_later(self) -> None:
+        """
+        Schedules a reconnect attempt, after which the reconnect callback of
+        the request being handled is called.
+        """
+        if (
+            self._pending_reconnect_callback is not None
+            and self._pending_reconnect_callback not in self._reconnect_callbacks
+        ):
+            self._reconnect_callbacks.append(self._pending_reconnect_callback)
+        self._retry_timer.start()
 
     def head(
         self, reconnect_callback: "function" = None, **signals_and_slots
@@ -100,14 +135,7 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         if signals_and_slots:
             self.signals_and_slots = signals_and_slots
 
-        if self._cooldown_timer_head.elapsed() < self._REQUEST_COOLDOWN:  # milliseconds
-            self._cooldown_wait_timer_head.start(
-                (self._REQUEST_COOLDOWN) - self._cooldown_timer_head.elapsed()
-            )
-        else:
-            self.reply = super().head(self._request)
-            self._connect_signals_and_slots()
-            self._cooldown_timer_head.start()
+        self.queue_request("head", qtn.QNetworkRequest(self._request), self._set_reply)
 
     def get(self, reconnect_callback: "function" = None, **signals_and_slots) -> None:
         if reconnect_callback:
@@ -116,14 +144,74 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         if signals_and_slots:
             self.signals_and_slots = signals_and_slots
 
-        if self._cooldown_timer_get.elapsed() < self._REQUEST_COOLDOWN:  # milliseconds
-            self._cooldown_wait_timer_get.start(
-                (self._REQUEST_COOLDOWN) - self._cooldown_timer_get.elapsed()
+        self.queue_request("get", qtn.QNetworkRequest(self._request), self._set_reply)
+
+    def _set_reply(self, reply: qtn.QNetworkReply) -> None:
+        self.reply = reply
+        self._connect_signals_and_slots()
+
+    def queue_request(
+        self,
+        operation: str,
+        request: qtn.QNetworkRequest,
+        reply_callback: Callable[[qtn.QNetworkReply], None],
+    ) -> None:
+        """
+        Queues a request that gets its own reply instead of `self.reply`.
+
+        Parameters
+        -----------
+            operation (str):
+                "get" or "head".
+            request (QNetworkRequest):
+                Request to send, see `create_request`.
+            reply_callback (Callable[[QNetworkReply], None]):
+                Called with the reply as soon as the request is sent, i.e.
+                once the rate limit of the request's host allows it.
+        """
+        host = request.url().host()
+        self._request_queues.setdefault(host, deque()).append(
+            (operation, request, reply_callback)
+        )
+        if host not in self._request_queue_timers:
+            request_queue_timer = qtc.QTimer(self)
+            request_queue_timer.setSingleShot(True)
+            request_queue_timer.timeout.connect(
+                partial(self._dispatch_queued_requests, host)
             )
-        else:
-            self.reply = super().get(self._request)
-            self._connect_signals_and_slots()
-            self._cooldown_timer_get.start()
+            self._request_queue_timers[host] = request_queue_timer
+
+        if not self._request_queue_timers[host].isActive():
+            self._dispatch_queued_requests(host)
+
+    def _get_token_bucket(self, host: str) -> TokenBucket:
+        if host not in self._token_buckets:
+            rate_limit = self._rate_limits["api" if host in self._API_HOSTS else "cdn"]
+            self._token_buckets[host] = TokenBucket(
+                rate_limit["rate"], rate_limit["burst"]
+            )
+        return self._token_buckets[host]
+
+    def _dispatch_queued_requests(self, host: str) -> None:
+        request_queue = self._request_queues[host]
+        token_bucket = self._get_token_bucket(host)
+        while request_queue:
+            if wait := token_bucket.take():
+                self._request_queue_timers[host].start(wait)
+                return
+
+            operation, request, reply_callback = request_queue.popleft()
+            if operation == "head":
+                reply = super().head(request)
+            else:
+                reply = super().get(request)
+            reply_callback(reply)
+
+    def clear_request_queue(self) -> None:
+        for request_queue in self._request_queues.values():
+            request_queue.clear()
+        for request_queue_timer in self._request_queue_timers.values():
+            request_queue_timer.stop()
 
     def _connect_signals_and_slots(self) -> None:
         for key, value in self.signals_and_slots.items():
@@ -141,14 +229,34 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         self._logger.warning(
             "[-4 Reply timeout error] Temporary error: attempting to reconnect."
         )
-        self._retry_timer.start()
+        self._retry_later()
         return -4
 
-    def handle_error(self, error: qtn.QNetworkReply.NetworkError) -> int:
+    def handle_error(
+        self,
+        error: qtn.QNetworkReply.NetworkError,
+        reconnect_callback: Callable = None,
+    ) -> int:
+        """
+        Parameters
+        -----------
+            error (QNetworkReply.NetworkError):
+                Error of the finished reply.
+            reconnect_callback (Callable, optional):
+                Called to restart the request after a temporary error. Defaults
+                to the `reconnect_callback` passed to `get`/`head`.
+        """
+        self._pending_reconnect_callback = (
+            reconnect_callback or self._reconnect_callback
+        )
         try:
-            return getattr(self, f"_handle_{int(error)}")()
+            handler = getattr(self, f"_handle_{int(error)}")
         except AttributeError:
             return self._handle_other(error)
+        else:
+            return handler()
+        finally:
+            self._pending_reconnect_callback = None
 
     def _handle_other(self, error) -> int:
         """
@@ -173,7 +281,7 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         self._logger.warning(
             "[1 Connection refused] Temporary error: attempting to reconnect."
         )
-        self._retry_timer.start()
+        self._retry_later()
         return 1
 
     def _handle_2(self) -> int:
@@ -184,7 +292,7 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         self._logger.warning(
             "[2 Remote host closed] Temporary error: attempting to reconnect."
         )
-        self._retry_timer.start()
+        self._retry_later()
         return 2
 
     def _handle_3(self) -> int:
@@ -195,7 +303,7 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         self._logger.warning(
             "[2 Host not found] Temporary error: attempting to reconnect."
         )
-        self._retry_timer.start()
+        self._retry_later()
         return 3
 
     def _handle_4(self) -> int:
@@ -205,7 +313,7 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         self._logger.warning(
             "[4 Timeout error] Temporary error: attempting to reconnect."
         )
-        self._retry_timer.start()
+        self._retry_later()
         return 4
 
     def _handle_5(self) -> int:
@@ -246,5 +354,5 @@ class NetworkAccessManagerBase(qtn.QNetworkAccessManager):
         self._logger.warning(
             "[403 Service unavailable] Temporary error: attempting to reconnect."
         )
-        self._retry_timer.start()
+        self._retry_later()
         return 403
@@ -117,10 +117,29 @@ class ServiceBase(qtc.QObject):
 
     def _get_next_image_file(self) -> Generator:
         """
-        Generator that yields file URLs from `gallery_metadata.files`.
+        Generator that yields (row, file URL) pairs from
+        `gallery_metadata.files`.
         """
         raise NotImplementedError
 
+    def _start_next_file_downloads(self) -> None:
+        """
+        Starts downloading the next files of the current gallery until
+        `_downloader` has no free download slot left, ends the gallery download
+        once every file is done.
+        """
+        while self._downloader.has_free_download_slot():
+            try:
+                row, url = next(self._file_url_generator)
+            except StopIteration:
+                # If no more file url in `self._file_url_generator`:
+                if not self._downloader.has_active_downloads():
+                    self._end_gallery_download()
+                return
+            else:
+                # Else start downloading file:
+                self._downloader.start_file_download(row, url)
+
     def _pass_through_filter(
         self, gallery_metadata: GalleryMetadataBase
     ) -> Union[str, bool]:
@@ -212,24 +231,22 @@ class ServiceBase(qtc.QObject):
         self._continue_gallery_download()
 
     # END METHODS
-    def _end_file_download(self) -> None:
+    def _end_file_download(self, row: int) -> None:
         """
         Denotes the completion of one file in the current gallery.
+
+        Parameters
+        -----------
+            row (int):
+                Row of the downloaded file in the download files model.
         """
         self._session_summary["files downloaded"] += 1
         self._session_summary[
             "total download size"
-        ] += self._download_files_model.get_current_data().file_size
+        ] += self._download_files_model.get_row_data(row).file_size
 
         self._output_dialog.update_file_progress()
-        try:
-            url = next(self._file_url_generator)
-        except StopIteration:
-            # If no more file url in `self._file_url_generator`:
-            self._end_gallery_download()
-        else:
-            # Else start downloading file:
-            self._downloader.start_file_download(url)
+        self._start_next_file_downloads()
 
     def _end_gallery_download(self) -> None:
         """
@@ -266,6 +283,9 @@ class ServiceBase(qtc.QObject):
             self._extractor.deleteLater()
             del self._extractor
 
+        if hasattr(self, "_downloader"):
+            self._downloader.abort()
+
         if hasattr(self, "_network_access_manager"):
             self._logger.debug("Deinitializing network access manager.")
             qtc.QObject.disconnect(self._network_access_manager, None, None, None)
@@ -418,29 +438,25 @@ class ServiceBase(qtc.QObject):
         self._continue_item_download()
 
     def _gallery_file_already_exists_slot(
-        self, current_working_loca_filename: str
+        self, row: int, current_working_loca_filename: str
     ) -> None:
         self._logger.info(
             f"File already exists: LOCATION={current_working_loca_filename}"
         )
         self._session_summary["files already downloaded"] += 1
         self._output_dialog.update_file_progress()
+        row_index = self._download_files_model.get_row_index(row)
         self._download_files_model.setData(
-            index=self._download_files_model.get_current_index().status,
+            index=row_index.status,
             value=1,
             for_="status",
-        )  # Set status of current to-be-downloaded file.
+        )  # Set status of this to-be-downloaded file.
         self._download_files_model.setData(
-            index=self._download_files_model.get_current_index().download_progress,
+            index=row_index.download_progress,
             value=-1,
             for_="progress",
-        )  # Set status of current to-be-downloaded file.
-        try:
-            url = next(self._file_url_generator)
-        except StopIteration:
-            self._end_gallery_download()
-        else:
-            self._downloader.start_file_download(url)
+        )  # Set status of this to-be-downloaded file.
+        self._start_next_file_downloads()
 
     def _ignore_or_download_gallery(self, result: list) -> None:
         if result != [] and result != [[]]:
@@ -487,6 +503,8 @@ class ServiceBase(qtc.QObject):
         downloader_signals.download_session_finished_signal.emit()
 
     def _output_dialog_canceled_slot(self) -> None:
+        if hasattr(self, "_downloader"):
+            self._downloader.abort()
         if hasattr(self._network_access_manager, "reply"):
             self._network_access_manager.abort()
         self._download_items_model.setData(
@@ -1,5 +1,7 @@
 import logging
 import os
+import re
+from functools import partial
 from weakref import proxy
 
 import magic
@@ -12,32 +14,65 @@ from library_of_h.downloader.base_classes.network_access_manager import \
     NetworkAccessManagerBase
 from library_of_h.downloader.custom_sub_classes.download_files_model import \
     DownloadFilesModel
+from library_of_h.preferences import Preferences
+
+
+class FileDownload:
+    """
+    State of one in-flight file download.
+    """
+
+    __slots__ = (
+        "row",
+        "url",
+        "local_file",
+        "reply",
+        "file_size",
+        "actual_total_bytes",
+        "download_timer",
+        "aborted",
+    )
+
+    def __init__(self, row: int, url: str, local_file: qtc.QFile) -> None:
+        self.row = row
+        self.url = url
+        self.local_file = local_file
+        self.reply: qtn.QNetworkReply = None
+        self.file_size = 0
+        self.actual_total_bytes = 0
+        self.download_timer = ElapsedTimer()
+        self.aborted = False
 
 
 class ServiceDownloaderBase(qtc.QObject):
 
     _logger: logging.Logger
-    _current_working_local_file: qtc.QFile
     _network_access_manager: NetworkAccessManagerBase
     _current_working_gallery_metadata: GalleryMetadataBase
 
     get_file_signal = qtc.Signal()
-    file_finished_signal = qtc.Signal()
-    gallery_file_already_exist_signal = qtc.Signal(str)
+    file_finished_signal = qtc.Signal(int)
+    gallery_file_already_exist_signal = qtc.Signal(int, str)
 
     def __init__(self) -> None:
         super().__init__()
 
-        self._current_downloading_file_size = 0
+        # Number of files of the current gallery downloaded at the same time.
+        self._max_file_downloads = max(
+            1,
+            Preferences.get_instance()["download_preferences", "concurrent_downloads"],
+        )
+        # Download files model row -> in-flight file download.
+        self._file_downloads: dict[int, FileDownload] = {}
 
-        self._download_timer = ElapsedTimer()
+        self._content_range_total_pattern = re.compile(rb"/(\d+)$")
 
     def set_network_access_manager(
         self, network_access_manager: NetworkAccessManagerBase
     ):
         self._network_access_manager = proxy(network_access_manager)
-        self._network_access_manager.disconnected.connect(self._download_timer.pause)
-        self._network_access_manager.reconnected.connect(self._download_timer.resume)
+        self._network_access_manager.disconnected.connect(self._pause_download_timers)
+        self._network_access_manager.reconnected.connect(self._resume_download_timers)
 
     def set_current_working_gallery_metadata(
         self, gallery_metadata: GalleryMetadataBase
@@ -47,7 +82,13 @@ class ServiceDownloaderBase(qtc.QObject):
     def set_download_files_model(self, download_files_model: DownloadFilesModel):
         self._download_files_model = download_files_model
 
-    def set_current_working_local_file(self, filename: str) -> None:
+    def has_free_download_slot(self) -> bool:
+        return len(self._file_downloads) < self._max_file_downloads
+
+    def has_active_downloads(self) -> bool:
+        return bool(self._file_downloads)
+
+    def _create_local_file(self, filename: str) -> qtc.QFile:
         location = qtc.QDir(self._current_working_gallery_metadata.location)
 
         if not location.mkpath(abs_save_destination := location.absolutePath()):
@@ -56,92 +97,184 @@ class ServiceDownloaderBase(qtc.QObject):
             )
             return
 
-        self._current_working_local_file = qtc.QFile(
-            os.path.join(abs_save_destination, filename)
+        return qtc.QFile(os.path.join(abs_save_destination, filename))
+
+    def _pause_download_timers(self) -> None:
+        for file_download in self._file_downloads.values():
+            file_download.download_timer.pause()
+
+    def _resume_download_timers(self) -> None:
+        for file_download in self._file_downloads.values():
+            file_download.download_timer.resume()
+
+    def _is_active(self, file_download: FileDownload) -> bool:
+        """
+        Whether `file_download` is still one of the in-flight file downloads,
+        i.e. it was neither aborted nor replaced by a restart.
+        """
+        return (
+            not file_download.aborted
+            and self._file_downloads.get(file_download.row) is file_download
         )
 
-    def _write_to_disk(self, data: qtc.QByteArray) -> None:
-        if self._current_working_local_file.write(data) == -1:
+    def _write_to_disk(self, file_download: FileDownload, data: qtc.QByteArray) -> None:
+        if file_download.local_file.write(data) == -1:
             self._logger.error(
-                f"[{self._current_working_local_file.errorString()}] "
+                f"[{file_download.local_file.errorString()}] "
                 "Error writing to file: "
-                f'File="{self._current_working_local_file.fileName()}"'
+                f'File="{file_download.local_file.fileName()}"'
             )
 
-    def _download_progress_slot(self, bytes_received: int, total_bytes: int) -> None:
+    def _download_progress_slot(
+        self, file_download: FileDownload, bytes_received: int, total_bytes: int
+    ) -> None:
         # To keep track of the appropriate amount for bytes received even after
         # a network disconnection; `_continue`ing causes `bytes_received` to
         # re-start from 0.
-        self._actual_total_bytes = max(self._actual_total_bytes, total_bytes)
-        bytes_received += self._actual_total_bytes - total_bytes
+        file_download.actual_total_bytes = max(
+            file_download.actual_total_bytes, total_bytes
+        )
+        bytes_received += file_download.actual_total_bytes - total_bytes
+        row_index = self._download_files_model.get_row_index(file_download.row)
         self._download_files_model.setData(
-            index=self._download_files_model.get_current_index().download_progress,
+            index=row_index.download_progress,
             value=bytes_received,
             for_="progress",
-        )  # Set progress for current downloading file.
+        )  # Set progress for this downloading file.
 
-        current_size = self._download_files_model.get_current_data().download_progress
+        current_size = self._download_files_model.get_row_data(
+            file_download.row
+        ).download_progress
         bytes_per_second = (
             current_size
-            / (self._download_timer.elapsed() or 1)  # Prevent zero division.
+            / (file_download.download_timer.elapsed() or 1)  # Prevent zero division.
         ) * 1000
 
         self._download_files_model.setData(
-            index=self._download_files_model.get_current_index().download_speed,
+            index=row_index.download_speed,
             value=bytes_per_second,
             for_="speed",
-        )  # Set progress for current downloading file.
+        )  # Set speed for this downloading file.
 
-    def _ready_read_slot(self) -> None:
-        data = self._network_access_manager.reply.readAll()
+    def _ready_read_slot(self, file_download: FileDownload) -> None:
+        data = file_download.reply.readAll()
+        if not file_download.local_file.isOpen():
+            # Body of an error/416 response, see `_GET_meta_data_changed_slot`.
+            return
         if "text/html" == magic.from_buffer(data.data(), mime=True):
             self._logger.error(
                 "[Unknown] Received text/html: "
                 f"GALLERY ID={self._current_working_gallery_metadata.gallery_id}, "
-                f"URL={self._network_access_manager.reply.url().toString()}"
+                f"URL={file_download.reply.url().toString()}"
             )
             return
-        self._write_to_disk(data)
+        self._write_to_disk(file_download, data)
+
+    def _HEAD(self, file_download: FileDownload) -> None:
+        self._network_access_manager.queue_request(
+            "head",
+            self._network_access_manager.create_request(file_download.url),
+            partial(self._HEAD_reply_slot, file_download),
+        )
+
+    def _HEAD_reply_slot(
+        self, file_download: FileDownload, reply: qtn.QNetworkReply
+    ) -> None:
+        if not self._is_active(file_download):
+            reply.abort()
+            reply.deleteLater()
+            return
+        file_download.reply = reply
+        reply.finished.connect(partial(self._HEAD_finished_slot, file_download))
+
+    def _GET(self, file_download: FileDownload, request: qtn.QNetworkRequest) -> None:
+        self._network_access_manager.queue_request(
+            "get", request, partial(self._GET_reply_slot, file_download)
+        )
 
-    def _HEAD(self, url: str) -> None:
-        self._network_access_manager.set_request_url(url)
-        self._network_access_manager.head(
-            reconnect_callback=lambda: self._HEAD(url),
-            finished=self._HEAD_finished_slot,
+    def _GET_reply_slot(
+        self, file_download: FileDownload, reply: qtn.QNetworkReply
+    ) -> None:
+        if not self._is_active(file_download):
+            reply.abort()
+            reply.deleteLater()
+            return
+        file_download.reply = reply
+        reply.metaDataChanged.connect(
+            partial(self._GET_meta_data_changed_slot, file_download)
+        )
+        reply.finished.connect(partial(self._GET_finished_slot, file_download))
+        reply.downloadProgress.connect(
+            partial(self._download_progress_slot, file_download)
         )
+        reply.readyRead.connect(partial(self._ready_read_slot, file_download))
 
     def download(self) -> None:
         self.get_file_signal.emit()
 
-    def start_file_download(self, url: str) -> None:
+    def start_file_download(self, row: int, url: str) -> None:
+        """
+        Starts downloading `url` to the file of row `row` of the download files
+        model, alongside the other in-flight file downloads.
+        """
+        local_file = self._create_local_file(
+            self._download_files_model.get_row_data(row).filename
+        )
+        if local_file is None:
+            return
+
         self._logger.info(f"Begin file download: URL={url}")
-        self._HEAD(url)
+        file_download = FileDownload(row, url, local_file)
+        self._file_downloads[row] = file_download
+        file_download.download_timer.start()
+        self._continue(file_download)
 
-    def _continue(self, url: str) -> None:
-        if not self._current_working_local_file.isOpen():
-            if not self._current_working_local_file.open(
-                qtc.QFile.OpenModeFlag.Append | qtc.QIODevice.OpenModeFlag.Text
-            ):
-                self._logger.error(
-                    f"[{self._current_working_local_file.errorString()}] "
-                    "Error opening file: "
-                    f'File="{self._current_working_local_file.fileName()}"'
-                )
-        self._network_access_manager.set_request_header(
+    def restart_file_download(self, row: int, url: str) -> None:
+        """
+        Restarts the in-flight file download of row `row` with a new `url`.
+        """
+        file_download = self._file_downloads.get(row)
+        if file_download is None:
+            return
+
+        self._discard_file_download(file_download)
+        self.start_file_download(row, url)
+
+    def _discard_file_download(self, file_download: FileDownload) -> None:
+        file_download.aborted = True
+        if file_download.reply is not None:
+            file_download.reply.abort()
+            file_download.reply.deleteLater()
+        if file_download.local_file.isOpen():
+            file_download.local_file.close()
+        if self._file_downloads.get(file_download.row) is file_download:
+            del self._file_downloads[file_download.row]
+
+    def abort(self) -> None:
+        """
+        Aborts every in-flight file download.
+        """
+        for file_download in tuple(self._file_downloads.values()):
+            self._discard_file_download(file_download)
+        self._network_access_manager.clear_request_queue()
+
+    def _continue(self, file_download: FileDownload) -> None:
+        """
+        Requests the remote file from the end of the local file onwards; the
+        remote file size is taken from the response, so no HEAD request is
+        needed.
+        """
+        if not self._is_active(file_download):
+            return
+
+        request = self._network_access_manager.create_request(file_download.url)
+        request.setRawHeader(
             qtc.QByteArray(b"Range"),
-            qtc.QByteArray(
-                f"bytes={self._current_working_local_file.size()}-".encode("utf-8")
-            ),
-        )
-        self._network_access_manager.set_request_url(url)
-        self._network_access_manager.get(
-            reconnect_callback=lambda: self._continue(url),
-            finished=self._GET_finished_slot,
-            downloadProgress=self._download_progress_slot,
-            readyRead=self._ready_read_slot,
+            qtc.QByteArray(f"bytes={file_download.local_file.size()}-".encode("utf-8")),
         )
+        self._GET(file_download, request)
 
-    def _check_file_existence(self) -> bool:
+    def _check_file_existence(self, file_download: FileDownload) -> bool:
         """
         Checks if a file already exists.
 
@@ -151,112 +284,231 @@ class ServiceDownloaderBase(qtc.QObject):
             False: File does not exist.
         """
         if (
-            self._current_working_local_file.exists()
-            and self._current_working_local_file.size()
-            == self._current_downloading_file_size
+            file_download.local_file.exists()
+            and file_download.local_file.size() == file_download.file_size
         ):
             return True
         return False
 
     def _handle_network_runtime_error(
-        self, error: qtn.QNetworkReply.NetworkError
+        self,
+        file_download: FileDownload,
+        error: qtn.QNetworkReply.NetworkError,
+        reconnect_callback: "function",
     ) -> int:
-        return self._network_access_manager.handle_error(error)
+        return self._network_access_manager.handle_error(error, reconnect_callback)
 
-    def _begin_download(self) -> None:
-        if not self._current_working_local_file.isOpen():
-            if not self._current_working_local_file.open(
+    def _begin_download(self, file_download: FileDownload) -> None:
+        if not file_download.local_file.isOpen():
+            if not file_download.local_file.open(
                 qtc.QFile.OpenModeFlag.WriteOnly | qtc.QIODevice.OpenModeFlag.Text
             ):
                 self._logger.error(
-                    f"[{self._current_working_local_file.errorString()}] "
+                    f"[{file_download.local_file.errorString()}] "
                     "Error opening file: "
-                    f'File="{self._current_working_local_file.fileName()}"'
+                    f'File="{file_download.local_file.fileName()}"'
                 )
 
         self._download_files_model.setData(
-            index=self._download_files_model.get_current_index().status,
+            index=self._download_files_model.get_row_index(file_download.row).status,
             value=0,
             for_="status",
-        )  # Set status of current to-be-downloaded file.
-
-        self._actual_total_bytes = 0
-        self._download_timer.start()
-        url = self._network_access_manager.reply.url().toString()
-        self._network_access_manager.get(
-            reconnect_callback=lambda: self._continue(url),
-            finished=self._GET_finished_slot,
-            downloadProgress=self._download_progress_slot,
-            readyRead=self._ready_read_slot,
-        )
+        )  # Set status of this to-be-downloaded file.
 
-    def _HEAD_finished_slot(self) -> None:
-        handled = self._handle_network_runtime_error(
-            self._network_access_manager.reply.error()
+        file_download.download_timer.start()
+        self._GET(
+            file_download,
+            self._network_access_manager.create_request(file_download.url),
         )
-        if handled != 0:
-            return
-
-        try:
-            self._current_downloading_file_size = int(
-                self._network_access_manager.reply.rawHeader(
-                    qtc.QByteArray(b"Content-Length")
-                ).data()
-            )
-        except ValueError:
-            # Sometimes, the Content-Length is `b''`. Might have been due to
-            # cache, most likely fixed with cache-control HTTP header set to
-            # no-cache.
-            self._logger.warning(
-                "[Unknown] Unable to get remote file size: "
-                f"URL={self._network_access_manager.reply.url().toString()}"
-            )
-            self._current_downloading_file_size = -1
 
+    def _set_remote_file_size(
+        self, file_download: FileDownload, file_size: int
+    ) -> bool:
+        """
+        Returns
+        --------
+            True: There is enough disk space for the file.
+            False: There is not.
+        """
+        file_download.file_size = file_download.actual_total_bytes = file_size
         if (
             qtc.QStorageInfo(
                 self._current_working_gallery_metadata.location
             ).bytesAvailable()
             + 1 * 1024
-            <= self._current_downloading_file_size
+            <= file_download.file_size
         ):
             self._logger.error(
                 "[NotEnoughSpace] "
                 "Disk running low on space: "
                 f"LOCATION={self._current_working_gallery_metadata.location}"
             )
-            return
+            return False
 
         self._download_files_model.setData(
-            index=self._download_files_model.get_current_index().file_size,
-            value=int(
-                self._network_access_manager.reply.rawHeader(
-                    qtc.QByteArray(b"Content-Length")
-                )
-                or -1
-            ),
+            index=self._download_files_model.get_row_index(file_download.row).file_size,
+            value=file_download.file_size,
             for_="size",
-        )  # Set size of current to-be-downloaded file.
+        )  # Set size of this to-be-downloaded file.
+        return True
 
-        if not self._check_file_existence():
-            # If file does not already exist:
-            self._begin_download()
+    def _get_content_range_total(self, reply: qtn.QNetworkReply) -> int:
+        """
+        Total size of the remote file from the "Content-Range" header,
+        `bytes 0-499/1234` and `bytes */1234` both give 1234.
+
+        Returns
+        --------
+            int:
+                The total size, -1 if it is unknown.
+        """
+        content_range = reply.rawHeader(qtc.QByteArray(b"Content-Range")).data()
+        if match := self._content_range_total_pattern.search(content_range):
+            return int(match.group(1))
+        return -1
+
+    def _GET_meta_data_changed_slot(self, file_download: FileDownload) -> None:
+        if not self._is_active(file_download):
+            return
+
+        reply = file_download.reply
+        status_code = reply.attribute(
+            qtn.QNetworkRequest.Attribute.HttpStatusCodeAttribute
+        )
+        if status_code == 206:
+            file_size = self._get_content_range_total(reply)
+        elif status_code == 200:
+            try:
+                file_size = int(
+                    reply.rawHeader(qtc.QByteArray(b"Content-Length")).data()
+                )
+            except ValueError:
+                file_size = -1
         else:
-            self.gallery_file_already_exist_signal.emit(
-                self._current_working_local_file.fileName()
+            # Errors, and 416 when the local file is already complete, are
+            # handled in `_GET_finished_slot`.
+            return
+
+        if status_code == 200 and not file_download.local_file.isOpen():
+            file_download.file_size = file_size
+            if self._check_file_existence(file_download):
+                # The range was ignored, but the local file is already complete.
+                self._discard_file_download(file_download)
+                self._file_already_exists(file_download)
+                return
+
+        if not file_download.local_file.isOpen():
+            if not file_download.local_file.open(
+                qtc.QFile.OpenModeFlag.Append | qtc.QIODevice.OpenModeFlag.Text
+            ):
+                self._logger.error(
+                    f"[{file_download.local_file.errorString()}] "
+                    "Error opening file: "
+                    f'File="{file_download.local_file.fileName()}"'
+                )
+                return
+        if status_code == 200:
+            # The whole file is being sent, regardless of the range.
+            file_download.local_file.resize(0)
+
+        if file_size == -1:
+            self._logger.warning(
+                "[Unknown] Unable to get remote file size: "
+                f"URL={reply.url().toString()}"
             )
+        if not self._set_remote_file_size(file_download, file_size):
+            self._discard_file_download(file_download)
+            return
+
+        self._download_files_model.setData(
+            index=self._download_files_model.get_row_index(file_download.row).status,
+            value=0,
+            for_="status",
+        )  # Set status of this to-be-downloaded file.
+
+    def _range_not_satisfiable(
+        self, file_download: FileDownload, reply: qtn.QNetworkReply
+    ) -> None:
+        """
+        The local file is at least as big as the remote one, which means it is
+        either complete or not the same file.
+        """
+        file_size = self._get_content_range_total(reply)
+        if file_size == -1:
+            # Remote file size unknown, fall back to a HEAD request.
+            self._HEAD(file_download)
+        elif not self._set_remote_file_size(file_download, file_size):
+            return
+        elif self._check_file_existence(file_download):
+            self._file_already_exists(file_download)
+        else:
+            self._begin_download(file_download)
+
+    def _file_already_exists(self, file_download: FileDownload) -> None:
+        self._file_downloads.pop(file_download.row, None)
+        self.gallery_file_already_exist_signal.emit(
+            file_download.row, file_download.local_file.fileName()
+        )
 
-    def _GET_finished_slot(self) -> None:
-        self._network_access_manager.set_request_header(
-            qtc.QByteArray(b"Range"), qtc.QByteArray(b"bytes=0-")
+    def _HEAD_finished_slot(self, file_download: FileDownload) -> None:
+        if not self._is_active(file_download):
+            return
+
+        reply = file_download.reply
+        reply.deleteLater()
+        file_download.reply = None
+
+        handled = self._handle_network_runtime_error(
+            file_download, reply.error(), partial(self._HEAD, file_download)
         )
+        if handled != 0:
+            return
+
+        try:
+            file_size = int(reply.rawHeader(qtc.QByteArray(b"Content-Length")).data())
+        except ValueError:
+            # Sometimes, the Content-Length is `b''`. Might have been due to
+            # cache, most likely fixed with cache-control HTTP header set to
+            # no-cache.
+            self._logger.warning(
+                "[Unknown] Unable to get remote file size: "
+                f"URL={reply.url().toString()}"
+            )
+            file_size = -1
+
+        if not self._set_remote_file_size(file_download, file_size):
+            return
+
+        if not self._check_file_existence(file_download):
+            # If file does not already exist:
+            self._begin_download(file_download)
+        else:
+            self._file_already_exists(file_download)
+
+    def _GET_finished_slot(self, file_download: FileDownload) -> None:
+        if not self._is_active(file_download):
+            return
+
+        reply = file_download.reply
+        reply.deleteLater()
+        file_download.reply = None
+
+        if (
+            reply.attribute(qtn.QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+            == 416
+        ):
+            # Range Not Satisfiable.
+            self._range_not_satisfiable(file_download, reply)
+            return
 
         handled = self._handle_network_runtime_error(
-            self._network_access_manager.reply.error()
+            file_download, reply.error(), partial(self._continue, file_download)
         )
         if handled == -4:
             self._download_files_model.setData(
-                index=self._download_files_model.get_current_index().download_speed,
+                index=self._download_files_model.get_row_index(
+                    file_download.row
+                ).download_speed,
                 value=0,
                 for_="speed",
             )  # -4 means disconnected, so set speed to 0 B/s.
@@ -264,34 +516,34 @@ class ServiceDownloaderBase(qtc.QObject):
         elif handled != 0:
             return
 
-        if self._current_working_local_file.isOpen():
-            self._current_working_local_file.close()
+        if file_download.local_file.isOpen():
+            file_download.local_file.close()
 
             if (
-                self._current_downloading_file_size != -1
-                and self._current_downloading_file_size
-                != self._current_working_local_file.size()
+                file_download.file_size != -1
+                and file_download.file_size != file_download.local_file.size()
             ):
                 self._logger.warning(
                     "[SizeMismatch] Error downloading file: re-downloading."
                 )
-                self._begin_download()
+                self._begin_download(file_download)
                 return
-            elif self._current_downloading_file_size == -1:
+            elif file_download.file_size == -1:
                 self._logger.warning(
                     "[InvalidRemoteFileSize] Unable to perform file size check: "
-                    f"URL={self._network_access_manager.reply.url().toString()}; "
-                    f'File="{self._current_working_local_file.fileName()}"'
+                    f"URL={reply.url().toString()}; "
+                    f'File="{file_download.local_file.fileName()}"'
                 )
 
         self._logger.info(
-            f"Finished file download: LOCATION={self._current_working_local_file.fileName()}"
+            f"Finished file download: LOCATION={file_download.local_file.fileName()}"
         )
 
         self._download_files_model.setData(
-            index=self._download_files_model.get_current_index().status,
+            index=self._download_files_model.get_row_index(file_download.row).status,
             value=1,
             for_="status",
-        )  # Set status of current to-be-downloaded file.
+        )  # Set status of this downloaded file.
 
-        self.file_finished_signal.emit()
+        del self._file_downloads[file_download.row]
+        self.file_finished_signal.emit(file_download.row)
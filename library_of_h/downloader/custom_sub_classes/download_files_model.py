@@ -133,6 +133,22 @@ class DownloadFilesModel(qtc.QAbstractTableModel):
         """
         Gets ModelIndex for current data row index.
 
+        Returns
+        --------
+            TableRowIndices:
+                status:
+                filename:
+                file_size:
+                download_speed:
+                download_progress:
+                    Index for the corresponding items in a table row.
+        """
+        return self.get_row_index(self._i)
+
+    def get_row_index(self, row: int) -> TableRowIndices:
+        """
+        Gets ModelIndex for data row index `row`.
+
         Returns
         --------
             TableRowIndices:
@@ -144,11 +160,11 @@ class DownloadFilesModel(qtc.QAbstractTableModel):
                     Index for the corresponding items in a table row.
         """
         return TableRowIndices(
-            self.createIndex(self._i, 0),  # Status
-            self.createIndex(self._i, 1),  # File name
-            self.createIndex(self._i, 2),  # File size
-            self.createIndex(self._i, 3),  # Download speed
-            self.createIndex(self._i, 4),  # Download progress
+            self.createIndex(row, 0),  # Status
+            self.createIndex(row, 1),  # File name
+            self.createIndex(row, 2),  # File size
+            self.createIndex(row, 3),  # Download speed
+            self.createIndex(row, 4),  # Download progress
         )
 
     def get_current_data(self) -> TableRowData:
@@ -170,12 +186,32 @@ class DownloadFilesModel(qtc.QAbstractTableModel):
                     Download progress of data in current index.
         """
 
+        return self.get_row_data(self._i)
+
+    def get_row_data(self, row: int) -> TableRowData:
+        """
+        Gets data in data row index `row` of data structure.
+
+        Returns
+        --------
+            TableRowData:
+                status:
+                    Status of data in `row`.
+                filename:
+                    Name of data in `row`.
+                file_size:
+                    Size in Bytes of data in `row`.
+                download_speed:
+                    Download speed of data in `row`.
+                download_progress:
+                    Download progress of data in `row`.
+        """
         return TableRowData(
-            self._data[0][self._i],
-            self._data[1][self._i],
-            self._data[2][self._i],
-            self._data[3][self._i],
-            self._data[4][self._i],
+            self._data[0][row],
+            self._data[1][row],
+            self._data[2][row],
+            self._data[3][row],
+            self._data[4][row],
         )
 
     def current(self) -> TableRowData:
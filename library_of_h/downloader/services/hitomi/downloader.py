@@ -3,8 +3,8 @@ from __future__ import annotations
 from PySide6 import QtCore as qtc
 from PySide6 import QtNetwork as qtn
 
-from library_of_h.downloader.base_classes.service_downloader import \
-    ServiceDownloaderBase
+from library_of_h.downloader.base_classes.service_downloader import (
+    FileDownload, ServiceDownloaderBase)
 from library_of_h.downloader.services.hitomi.common import *
 from library_of_h.downloader.services.hitomi.constants import *
 from library_of_h.downloader.services.hitomi.metadata import \
@@ -33,13 +33,35 @@ class HitomiDownloader(ServiceDownloaderBase):
             sub_type=SubType.DLDR,
         )
 
-    def _handle_network_runtime_error(self, error: qtn.QNetworkReply.NetworkError):
+        # Rows of the file downloads that failed because of gg.js changing,
+        # restarted with new URLs once gg.js is updated.
+        self._gg_failed_rows = []
+
+    def _handle_network_runtime_error(
+        self,
+        file_download: FileDownload,
+        error: qtn.QNetworkReply.NetworkError,
+        reconnect_callback: "function",
+    ) -> int:
         if self._current_working_gallery_metadata.type_ == "anime":
-            return self._network_access_manager.handle_error(error)
+            return self._network_access_manager.handle_error(error, reconnect_callback)
 
         # This is only for image download because there is no gg.js magic for
         # video files (none that I know of at least).
-        return self._network_access_manager.handle_gg_error(error)
+        handled = self._network_access_manager.handle_gg_error(
+            error, reconnect_callback
+        )
+        if handled == 201 or handled == 203:
+            self._gg_failed_rows.append(file_download.row)
+        return handled
+
+    def take_gg_failed_rows(self) -> list[int]:
+        """
+        Returns the rows of the file downloads that failed because of gg.js
+        changing, and forgets them.
+        """
+        gg_failed_rows, self._gg_failed_rows = self._gg_failed_rows, []
+        return gg_failed_rows
 
     def download(self) -> None:
         self.get_file_signal.emit(
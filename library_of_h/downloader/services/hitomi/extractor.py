@@ -8,6 +8,7 @@ from weakref import proxy
 
 from PySide6 import QtCore as qtc
 
+from library_of_h.downloader.base_classes.extractor import ExtractorBase
 from library_of_h.downloader.services.hitomi.constants import *
 from library_of_h.downloader.services.hitomi.metadata import (
     HitomiFileMetadata, HitomiGalleryMetadata)
@@ -16,7 +17,7 @@ from library_of_h.miscellaneous.functions import utc_to_local
 from library_of_h.preferences import Preferences
 
 
-class HitomiExtractor(qtc.QObject):
+class HitomiExtractor(ExtractorBase):
 
     _logger: logging.Logger
 
@@ -125,6 +126,7 @@ class HitomiExtractor(qtc.QObject):
                     + NOZOMIEXTENSION
                 )
 
+        self._reset_prefetch()
         self._get_nozomi(nozomi_address)
 
     def _get_nozomi_finished_slot(self) -> None:
@@ -151,6 +153,9 @@ class HitomiExtractor(qtc.QObject):
         )
 
     def next_nozomi(self) -> int:
+        if (gallery_id := self._take_prefetched_gallery()) is not None:
+            return gallery_id
+
         try:
             return next(self._nozomi_generator)
         except (
@@ -165,29 +170,22 @@ class HitomiExtractor(qtc.QObject):
             self.item_finished_signal.emit()
             return -1
 
-    def _get_gallery_metadata_finished_slot(self) -> None:
-        handled = self._network_access_manager.handle_error(
-            self._network_access_manager.reply.error()
-        )
-        if handled == 203:
-            self.item_invalid_signal.emit()
-            return
-        elif handled != 0:
-            return
+    def _next_gallery_ahead(self) -> int:
+        try:
+            return next(self._nozomi_generator)
+        except AttributeError:
+            # No nozomi if download type is Gallery ID(s).
+            raise StopIteration
 
-        self._extract_gallery_metadata()
+    def _gallery_metadata_url(self, gallery_id: int) -> str:
+        return GALLERY_JS.format(gallery_id=gallery_id)
 
-    def get_gallery_metadata(self, gallery_id: int) -> None:
-        self._network_access_manager.set_request_url(
-            GALLERY_JS.format(gallery_id=gallery_id)
-        )
-        self._network_access_manager.get(
-            reconnect_callback=lambda: self.get_gallery_metadata(gallery_id),
-            finished=self._get_gallery_metadata_finished_slot,
-        )
+    def _gallery_metadata_not_found(self, gallery_id: int) -> None:
+        self.item_invalid_signal.emit()
 
-    def _extract_gallery_metadata(self) -> HitomiGalleryMetadata:
-        reply_text = self._network_access_manager.reply.readAll().data().decode("utf-8")
+    def _extract_gallery_metadata(
+        self, gallery_id: int, reply_text: str
+    ) -> HitomiGalleryMetadata:
         try:
             json_data = re.search(r"{[\s\S]*}", reply_text).group(0)
         except AttributeError as e:  # NoneType has no attribute `group`
@@ -195,7 +193,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get gallery metadata JSON from JS API] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -206,7 +204,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to load gallery metadata JSON from API] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -217,7 +215,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get gallery ID from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -228,7 +226,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get title from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -241,7 +239,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get Japanese title from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -254,7 +252,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get artist(s) list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
         except TypeError:
@@ -269,7 +267,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get group(s) list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
         except TypeError:
@@ -283,7 +281,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get gallery type from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -295,7 +293,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get gallery language from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -314,7 +312,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get character(s) list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
         except TypeError:
@@ -343,7 +341,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get tag(s) list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -360,7 +358,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get upload date from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -389,7 +387,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get file(s) list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
         except TypeError as e:  # 'NoneType' is not subscriptable.
@@ -398,7 +396,7 @@ class HitomiExtractor(qtc.QObject):
                 "[AssumptionError: unable to extract file(s) data from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely Hitomi made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1].split('.')[0]}"
+                f"GALLERY ID={gallery_id}"
             )
             return
 
@@ -429,7 +427,7 @@ class HitomiExtractor(qtc.QObject):
             self._destination_formats[self._download_type]["filename_format"],
             self._item,
         )
-        self.metadata_ready_signal.emit(gallery_metadata)
+        return gallery_metadata
 
     def get_download_item_url(self, item: str) -> str:
         if self._search_category == "":
@@ -135,39 +135,20 @@ class Hitomi(ServiceBase):
         For when the gallery is an anime gallery.
         Only ever yields a single value.
         """
-        try:
-            filename = next(self._download_files_model).filename
-        except (StopIteration, ValueError):
-            self._end_gallery_download()
-        else:
-            self._downloader.set_current_working_local_file(filename)
-
         url = "https:" + url_from_url(
             "//g.hitomi.la/videos/"
             + self._current_working_gallery_metadata.videofilename
         )
-        yield url
+        yield 0, url
 
     def _get_next_image_file(self) -> Generator:
         """
-        Generator that yields file URLs.
+        Generator that yields (row, file URL) pairs.
         """
-        # URL can change due to gg.js changing, but fret not, just call
-        # this function and you get the new URL!
-        for file in self._current_working_gallery_metadata.files:
-            try:
-                filename = next(self._download_files_model).filename
-            except (StopIteration, ValueError):
-                self._end_gallery_download()
-            else:
-                self._downloader.set_current_working_local_file(filename)
-
-                url = self._get_file_url(file)
-                while True:
-                    get_previous = yield url
-                    if get_previous is True:
-                        yield file
-                    break
+        # URL can change due to gg.js changing, but fret not, URLs are only
+        # created when the file download is about to start.
+        for row, file in enumerate(self._current_working_gallery_metadata.files):
+            yield row, self._get_file_url(file)
 
     # BEGIN METHODS
     def _begin_item_download(self, url_or_gallery_id: str) -> None:
@@ -275,16 +256,12 @@ class Hitomi(ServiceBase):
     # SLOTS
     def _get_file_slot(self, type_: str) -> None:
         self._file_url_generator = getattr(self, f"_get_next_{type_}_file")()
-        try:
-            url = next(self._file_url_generator)
-        except StopIteration:
-            self._end_gallery_download()
-        else:
-            self._downloader.start_file_download(url)
+        self._start_next_file_downloads()
 
     def _gg_error_handled_slot(self) -> None:
-        url = self._get_file_url(self._file_url_generator.send(True))
-        self._downloader.start_file_download(url)
+        files = self._current_working_gallery_metadata.files
+        for row in self._downloader.take_gg_failed_rows():
+            self._downloader.restart_file_download(row, self._get_file_url(files[row]))
 
     def _nozomi_ready_slot(self, total_galleries: int) -> None:
         gallery_id = self._extractor.next_nozomi()
@@ -11,6 +11,8 @@ from library_of_h.logger import MainType, ServiceType, SubType, get_logger
 
 class HitomiNetworkAccessManager(NetworkAccessManagerBase):
 
+    _API_HOSTS = ("hitomi.la", DOMAIN)
+
     gg_error_handled_signal = qtc.Signal()
 
     def __init__(self, *args, **kwargs) -> None:
@@ -31,17 +33,24 @@ class HitomiNetworkAccessManager(NetworkAccessManagerBase):
             sub_type=SubType.NAMGR,
         )
 
-    def handle_gg_error(self, error: qtn.QNetworkReply.NetworkError) -> int:
+        self._getting_gg = False
+
+    def handle_gg_error(
+        self, error: qtn.QNetworkReply.NetworkError, reconnect_callback=None
+    ) -> int:
         if int(error) == 201 or int(error) == 203:
             if int(error) == 201:
                 self._logger.warning("[201 Access denied]")
             else:
                 self._logger.warning("[203 Page not found]")
-            self._logger.warning("Remote gg.js changed.")
-            self.get_gg()
+            if not self._getting_gg:
+                # Every in-flight file download fails the same way when gg.js
+                # changes, only get it once for all of them.
+                self._logger.warning("Remote gg.js changed.")
+                self.get_gg()
             return int(error)
         else:
-            return super().handle_error(error)
+            return super().handle_error(error, reconnect_callback)
 
     def get_gg(self) -> None:
         """
@@ -51,13 +60,23 @@ class HitomiNetworkAccessManager(NetworkAccessManagerBase):
             https://**{gg.m()}**a.hitomi.la/{dir}/**{gg.b}**/{some_number_based_on_hash}/{file_hash}.{ext}
         where the above link is a template for any gallery's image link(s).
         """
+        self._getting_gg = True
         gg_url = "https://" + DOMAIN + "/gg.js"
-        self.set_request_url(gg_url)
-        self.get(readyRead=self._check_gg)
+        self.queue_request("get", self.create_request(gg_url), self._get_gg_reply_slot)
+
+    def _get_gg_reply_slot(self, reply: qtn.QNetworkReply) -> None:
+        self._gg_reply = reply
+        self._gg_reply.finished.connect(self._check_gg)
 
     def _check_gg(self) -> None:
-        new_gg = self.reply.readAll().data().decode("utf-8")
-        self.reply.close()
+        self._getting_gg = False
+        handled = self.handle_error(self._gg_reply.error(), self.get_gg)
+        if handled != 0:
+            self._gg_reply.deleteLater()
+            return
+
+        new_gg = self._gg_reply.readAll().data().decode("utf-8")
+        self._gg_reply.deleteLater()
         try:
             new_o = re.findall("var o = ([0-9]*)", new_gg)[0]
             new_new_o = re.findall("o = ([0-9]*); break;", new_gg)[0]
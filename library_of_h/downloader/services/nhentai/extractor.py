@@ -8,6 +8,7 @@ from weakref import proxy
 from bs4 import BeautifulSoup
 from PySide6 import QtCore as qtc
 
+from library_of_h.downloader.base_classes.extractor import ExtractorBase
 from library_of_h.downloader.services.nhentai.constants import *
 from library_of_h.downloader.services.nhentai.metadata import (
     nhentaiFileMetadata, nhentaiGalleryMetadata)
@@ -17,7 +18,7 @@ from library_of_h.logger import MainType, ServiceType, SubType, get_logger
 from library_of_h.preferences import Preferences
 
 
-class nhentaiExtractor(qtc.QObject):
+class nhentaiExtractor(ExtractorBase):
 
     _logger: logging.Logger
     _current_gallery: tuple(int, int)
@@ -186,6 +187,7 @@ class nhentaiExtractor(qtc.QObject):
         self._parse_page_html()
 
     def get_page(self, url: str) -> None:
+        self._reset_prefetch()
         self._current_url = url
         self._current_page_page_number = 1
         self._network_access_manager.set_request_url(
@@ -206,6 +208,10 @@ class nhentaiExtractor(qtc.QObject):
         )
 
     def next_gallery(self) -> int:
+        if (gallery := self._take_prefetched_gallery()) is not None:
+            self._current_gallery = gallery
+            return self._current_gallery
+
         try:
             self._current_gallery = next(self._galleries)
         except StopIteration:
@@ -227,6 +233,7 @@ class nhentaiExtractor(qtc.QObject):
         self._parse_gallery_html()
 
     def get_gallery_CDN_server(self, gallery_id: int) -> None:
+        self._reset_prefetch()
         self._current_url = GALLERY_PAGE.format(gallery_id=gallery_id)
         self._current_page_page_number = 1
         self._network_access_manager.set_request_url(self._current_url)
@@ -260,33 +267,23 @@ class nhentaiExtractor(qtc.QObject):
 
         return download_item_url
 
-    def _get_gallery_metadata_finished_slot(self) -> None:
-        handled = self._network_access_manager.handle_error(
-            self._network_access_manager.reply.error()
-        )
-        if handled == 203:
-            self._logger.error(
-                "[AssumptionError: Unable to load gallery metadata] "
-                "Most likely nhentai made changes to their website. "
-                f"URL={self._network_access_manager.reply.url().toString()}"
-            )
-            return
-        elif handled != 0:
-            return
+    def _next_gallery_ahead(self) -> tuple[int, int]:
+        # Only the galleries of the current page are known ahead of time.
+        return next(self._galleries)
 
-        self._extract_gallery_metadata()
+    def _gallery_metadata_url(self, gallery: tuple[int, int]) -> str:
+        return GALLERY_JSON.format(gallery_id=gallery[1])
 
-    def get_gallery_metadata(self, gallery_id: int) -> None:
-        self._network_access_manager.set_request_url(
-            GALLERY_JSON.format(gallery_id=gallery_id)
-        )
-        self._network_access_manager.get(
-            reconnect_callback=lambda: self.get_gallery_metadata(gallery_id),
-            finished=self._get_gallery_metadata_finished_slot,
+    def _gallery_metadata_not_found(self, gallery: tuple[int, int]) -> None:
+        self._logger.error(
+            "[AssumptionError: Unable to load gallery metadata] "
+            "Most likely nhentai made changes to their website. "
+            f"URL={self._gallery_metadata_url(gallery)}"
         )
 
-    def _extract_gallery_metadata(self) -> nhentaiGalleryMetadata:
-        reply_text = self._network_access_manager.reply.readAll().data().decode("utf-8")
+    def _extract_gallery_metadata(
+        self, gallery: tuple[int, int], reply_text: str
+    ) -> nhentaiGalleryMetadata:
         try:
             json_data = json.loads(reply_text)
         except json.JSONDecodeError as e:
@@ -294,7 +291,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to load gallery metadata JSON from API] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -305,7 +302,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get gallery ID from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -316,7 +313,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get media ID from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -327,7 +324,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get English title from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -338,7 +335,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get Japanese title from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -353,7 +350,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get artist(s) list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
         except KeyError as e:
@@ -361,7 +358,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get artist(s) names from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -376,7 +373,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get group(s) list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
         except KeyError as e:
@@ -384,7 +381,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get group(s) names from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -402,7 +399,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get category from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
         except KeyError as e:
@@ -410,7 +407,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get category name from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -428,7 +425,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get language from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
         except KeyError as e:
@@ -436,7 +433,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get language names from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -451,7 +448,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get parodies list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
         except KeyError as e:
@@ -459,7 +456,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get parodies names from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -474,7 +471,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get character(s) list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
         except KeyError as e:
@@ -482,7 +479,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get character(s) names from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -495,7 +492,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get tag(s) list from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
         except KeyError as e:
@@ -503,7 +500,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get tag(s) names from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
@@ -518,13 +515,13 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to get upload date from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
 
         try:
             files = nhentaiFileMetadata()
-            server_n, gallery_id = self._current_gallery
+            server_n, gallery_id = gallery
             for page_n, file_dict in enumerate(
                 json_data.get("images").get("pages"), start=1
             ):
@@ -546,7 +543,7 @@ class nhentaiExtractor(qtc.QObject):
                 "[AssumptionError: unable to extract file(s) data from metadata JSON] "
                 f"[{str(e)}] "
                 "Most likely nhentai made changes to their website. "
-                f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                f"GALLERY ID={gallery[1]}"
             )
             return
         except KeyError as e:  # For EXTENSIONS[file_dict.get('t')]
@@ -555,7 +552,7 @@ class nhentaiExtractor(qtc.QObject):
                     "[AssumptionError: unable to extract file(s) extensions from metadata JSON] "
                     f"[{str(e)}] "
                     "Most likely nhentai made changes to their website. "
-                    f"GALLERY ID={self._network_access_manager.reply.url().toString().split('/')[-1]}"
+                    f"GALLERY ID={gallery[1]}"
                 )
             else:
                 self._logger.error(
@@ -589,4 +586,4 @@ class nhentaiExtractor(qtc.QObject):
             self._destination_formats[self._download_type]["filename_format"],
             self._item,
         )
-        self.metadata_ready_signal.emit(gallery_metadata)
+        return gallery_metadata
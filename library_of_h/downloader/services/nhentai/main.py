@@ -146,22 +146,11 @@ class nhentai(ServiceBase):
 
     def _get_next_image_file(self) -> Generator:
         """
-        Generator that yields file URLs from `gallery_metadata.files`.
+        Generator that yields (row, file URL) pairs from
+        `gallery_metadata.files`.
         """
-        for file in self._current_working_gallery_metadata.files:
-            try:
-                filename = next(self._download_files_model).filename
-            except (StopIteration, ValueError):
-                self._end_gallery_download()
-            else:
-                self._downloader.set_current_working_local_file(filename)
-
-                url = file.file_url
-                while True:
-                    get_previous = yield url
-                    if get_previous is True:
-                        yield file
-                    break
+        for row, file in enumerate(self._current_working_gallery_metadata.files):
+            yield row, file.file_url
 
     # BEGIN METHODS
     def _begin_item_download(self, url_or_gallery_id: str) -> None:
@@ -211,7 +200,7 @@ class nhentai(ServiceBase):
         )
         self._output_dialog.set_gallery_progress_max_value(total_galleries)
         self._logger.info(f"Begin gallery download: GALLERY ID={gallery_id}")
-        self._extractor.get_gallery_metadata(gallery_id)
+        self._extractor.get_gallery_metadata(gallery)
 
     def _begin_file_download(self) -> None:
         """
@@ -246,7 +235,7 @@ class nhentai(ServiceBase):
         if (gallery := self._extractor.next_gallery()) != -1:
             _, gallery_id = gallery
             self._logger.info(f"Begin gallery download: GALLERY ID={gallery_id}")
-            self._extractor.get_gallery_metadata(gallery_id)
+            self._extractor.get_gallery_metadata(gallery)
 
     # END METHODS
     def _end_gallery_download(self) -> None:
@@ -262,12 +251,7 @@ class nhentai(ServiceBase):
 
     def _get_file_slot(self) -> None:
         self._file_url_generator = self._get_next_image_file()
-        try:
-            url = next(self._file_url_generator)
-        except StopIteration:
-            self._end_gallery_download()
-        else:
-            self._downloader.start_file_download(url)
+        self._start_next_file_downloads()
 
     def _page_ready_slot(self, total_galleries: int) -> None:
         gallery = self._extractor.next_gallery()
@@ -7,6 +7,9 @@ from library_of_h.logger import MainType, ServiceType, SubType, get_logger
 
 
 class nhentaiNetworkAccessManager(NetworkAccessManagerBase):
+
+    _API_HOSTS = ("nhentai.net", "www.nhentai.net")
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._request.setRawHeader(
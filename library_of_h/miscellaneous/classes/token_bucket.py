@@ -0,0 +1,43 @@
+import math
+import time
+
+
+class TokenBucket:
+    """
+    Allows bursts of up to `burst` operations, refilled at `rate` operations
+    per second. A non-positive `rate` means no limit.
+    """
+
+    __slots__ = ("_rate", "_burst", "_tokens", "_last_refill")
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._rate = rate
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._last_refill = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._last_refill) * self._rate
+        )
+        self._last_refill = now
+
+    def take(self) -> int:
+        """
+        Takes a token, if one is available.
+
+        Returns
+        --------
+            int:
+                0 if a token was taken, else the number of milliseconds until
+                one is available.
+        """
+        if self._rate <= 0:
+            return 0
+
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return math.ceil((1 - self._tokens) / self._rate * 1000)
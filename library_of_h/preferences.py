@@ -22,6 +22,20 @@ class Preferences:
             },
             "download_preferences": {
                 "overwrite": False,
+                "concurrent_downloads": 1,
+                # Requests per second ("rate") and requests allowed at once
+                # ("burst"), per host; "api" for webpages/metadata and "cdn"
+                # for files.
+                "rate_limits": {
+                    "Hitomi": {
+                        "api": {"rate": 0.5, "burst": 1},
+                        "cdn": {"rate": 5.0, "burst": 5},
+                    },
+                    "nhentai": {
+                        "api": {"rate": 0.5, "burst": 1},
+                        "cdn": {"rate": 5.0, "burst": 5},
+                    },
+                },
                 "destination_formats": {
                     "Hitomi": {
                         "Artist(s)": {
@@ -157,6 +171,17 @@ PREFERENCES_TEMPLATE = {
     "database_preferences": {"location": "", "compare_like": ""},
     "download_preferences": {
         "overwrite": "",
+        "concurrent_downloads": "",
+        "rate_limits": {
+            "Hitomi": {
+                "api": {"rate": "", "burst": ""},
+                "cdn": {"rate": "", "burst": ""},
+            },
+            "nhentai": {
+                "api": {"rate": "", "burst": ""},
+                "cdn": {"rate": "", "burst": ""},
+            },
+        },
         "destination_formats": {
             "Hitomi": {
                 "Artist(s)": {"location_format": "", "filename_format": ""},
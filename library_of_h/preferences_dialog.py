@@ -165,7 +165,7 @@ class PreferencesDialog(qtw.QDialog):
 
         super().__init__(*args, **kwargs)
         self.setLayout(qtw.QGridLayout())
-        self.setMaximumHeight(267)
+        self.setMaximumHeight(297)
         self.setWindowTitle("Preferences")
         self.setWindowIcon(qtg.QIcon.fromTheme("preferences-system"))
 
@@ -177,7 +177,7 @@ class PreferencesDialog(qtw.QDialog):
 
         self._preferences_widget = qtw.QWidget()
         self._preferences_widget.setLayout(qtw.QVBoxLayout())
-        self._preferences_widget.setMaximumHeight(213)
+        self._preferences_widget.setMaximumHeight(243)
 
         self._preferences_scroll_area = qtw.QScrollArea(self)
         self._preferences_scroll_area.setWidgetResizable(True)
@@ -202,6 +202,9 @@ class PreferencesDialog(qtw.QDialog):
         self._preferences_copy[
             "download_preferences", "overwrite"
         ] = self._downloader_overwrite_check_box.isChecked()
+        self._preferences_copy[
+            "download_preferences", "concurrent_downloads"
+        ] = self._downloader_concurrent_downloads_spin_box.value()
 
         if not self._preferences == self._preferences_copy:
             self._preferences_copy.save()
@@ -254,7 +257,7 @@ class PreferencesDialog(qtw.QDialog):
 
     def _create_downloader_preferences(self):
         self._downloader_group_box = qtw.QGroupBox("Downloader preferences", self)
-        self._downloader_group_box.setMaximumHeight(106)
+        self._downloader_group_box.setMaximumHeight(136)
         self._downloader_group_box.setLayout(qtw.QFormLayout())
 
         self._downloader_overwrite_check_box = qtw.QCheckBox(self)
@@ -266,6 +269,16 @@ class PreferencesDialog(qtw.QDialog):
             )
         )
 
+        self._downloader_concurrent_downloads_spin_box = qtw.QSpinBox(self)
+        self._downloader_concurrent_downloads_spin_box.setRange(1, 16)
+        self._downloader_concurrent_downloads_spin_box.setToolTip(
+            "Number of files of a gallery downloaded at the same time."
+        )
+
+        self._downloader_concurrent_downloads_label = qtw.QLabel(
+            "Concurrent downloads", self
+        )
+
         self._downloader_destination_formats_widget = qtw.QWidget()
         self._downloader_destination_formats_widget.setLayout(qtw.QGridLayout())
 
@@ -295,6 +308,10 @@ class PreferencesDialog(qtw.QDialog):
         self._downloader_group_box.layout().addRow(
             self._downloader_overwrite_check_box, self._downloader_overwrite_label
         )
+        self._downloader_group_box.layout().addRow(
+            self._downloader_concurrent_downloads_spin_box,
+            self._downloader_concurrent_downloads_label,
+        )
         self._downloader_group_box.layout().addRow(
             self._downloader_destination_formats_widget
         )
@@ -325,6 +342,11 @@ class PreferencesDialog(qtw.QDialog):
         self._downloader_overwrite_check_box.setChecked(
             self._preferences_copy[(*mode, "download_preferences", "overwrite")]
         )
+        self._downloader_concurrent_downloads_spin_box.setValue(
+            self._preferences_copy[
+                (*mode, "download_preferences", "concurrent_downloads")
+            ]
+        )
 
     def _database_location_dialog_button_clicked_slot(self) -> None:
         self._database_location_line_edit.setText(